@@ -1,11 +1,18 @@
 import argparse
 import datetime
-import dateutil
+import functools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from collections import defaultdict
-from typing import Any, Dict, Optional, List
+from collections import Counter, defaultdict
+from typing import Any, Dict, FrozenSet, Optional, List, Set, Tuple
 
 import boto3
+import botocore.exceptions
+from botocore.config import Config
 from botocove import cove, CoveSession
 import logging
 
@@ -23,6 +30,39 @@ logger.addHandler(stream_handler)
 logger.setLevel(logging.INFO)
 
 has_enumeration_errors: bool = False
+results_cache_ttl: Optional[int] = None
+has_cached_results: bool = False
+use_config_counts: bool = False
+
+MAX_WORKERS = 32
+DEFAULT_ACCOUNT_WORKERS = 20
+IMAGE_ATTRIBUTE_WORKERS = 16
+ECS_CLUSTER_WORKERS = 16
+# terminated instances stay visible for about an hour, they are not workloads
+ACTIVE_INSTANCE_FILTER = {'Name': 'instance-state-name', 'Values': ['pending', 'running', 'stopping', 'stopped']}
+# EKS tags every node with the name of its cluster
+EKS_NODE_FILTER = {'Name': 'tag-key', 'Values': ['aws:eks:cluster-name']}
+BOTO_CONFIG = Config(max_pool_connections=100, retries={"max_attempts": 10, "mode": "adaptive"},
+                     tcp_keepalive=True, connect_timeout=5, read_timeout=60)
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "orca")
+REGIONS_CACHE_TTL = 24 * 60 * 60
+DEFAULT_RESULTS_CACHE_TTL = 60 * 60
+ENABLED_REGIONS_FILTER = {'Name': 'opt-in-status', 'Values': ['opt-in-not-required', 'opted-in']}
+# services whose count equals the number of resources AWS Config records for a single resource type
+CONFIG_RESOURCE_TYPES = {
+    "ec2": "AWS::EC2::Instance",
+    "lambda": "AWS::Lambda::Function",
+    "ecr": "AWS::ECR::Repository"
+}
+TRANSPORT_ERRORS = (botocore.exceptions.ConnectionError, botocore.exceptions.HTTPClientError)
+REGION_FAILURES_THRESHOLD = 2
+
+sessions: Dict[int, boto3.Session] = {}
+cove_clients: Dict[int, Dict[Tuple[str, Optional[str]], Any]] = {}
+account_ids: Dict[int, str] = {}
+account_id_lock = threading.Lock()
+client_lock = threading.Lock()
 
 
 @dataclass
@@ -31,99 +71,228 @@ class VmImage:
     create_time: datetime.datetime
 
 
+class RegionSkippedError(Exception):
+    pass
+
+
+class RegionCircuitBreaker:
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self._failed_services: Dict[Tuple[Any, Optional[str]], Set[str]] = defaultdict(set)
+        self._reported: Set[Tuple[Any, Optional[str]]] = set()
+        self._lock = threading.Lock()
+
+    def is_open(self, session_key: Any, region_name: Optional[str]) -> bool:
+        with self._lock:
+            return len(self._failed_services[(session_key, region_name)]) >= self.threshold
+
+    def record_failure(self, session_key: Any, region_name: Optional[str], service: str) -> None:
+        with self._lock:
+            self._failed_services[(session_key, region_name)].add(service)
+
+    def report_skip(self, session_key: Any, region_name: Optional[str]) -> bool:
+        # returns True only for the first skipped call of a region, so the skip is logged once
+        with self._lock:
+            if (session_key, region_name) in self._reported:
+                return False
+            self._reported.add((session_key, region_name))
+            return True
+
+
+region_breaker = RegionCircuitBreaker(REGION_FAILURES_THRESHOLD)
+
+
+def get_breaker_key(session: CoveSession) -> Any:
+    # cove sessions are short lived, key them by account so a reused id() never inherits another account's failures
+    if hasattr(session, "session_information"):
+        return session.session_information['Id']
+    return id(session)
+
+
+def create_client(session: CoveSession, service: str, region_name: Optional[str]) -> Any:
+    client = session.client(service, region_name=region_name, config=BOTO_CONFIG)
+    breaker_key = get_breaker_key(session)
+
+    # every failed attempt is recorded, not only exhausted retries, so the breaker opens while the
+    # region's other services are still retrying and their next attempt is refused in before-send
+    def record_transport_error(caught_exception: Optional[Exception] = None, **kwargs) -> None:
+        if isinstance(caught_exception, TRANSPORT_ERRORS):
+            region_breaker.record_failure(breaker_key, region_name, service)
+
+    def check_region_breaker(**kwargs) -> None:
+        if region_breaker.is_open(breaker_key, region_name):
+            raise RegionSkippedError(f"region {region_name} is skipped after repeated connection failures")
+
+    client.meta.events.register("needs-retry", record_transport_error)
+    client.meta.events.register("before-send", check_region_breaker)
+    return client
+
+
 def get_aws_account_id(session: boto3.session) -> str:
-    try:
-        sts_client = session.client('sts')
-        identity = sts_client.get_caller_identity()
-        return identity['Account']
-    except Exception:
-        return "AccountIdNotFound"
+    # resolved once per session under a lock, a failure is remembered too so it doesn't retry STS on every call
+    session_key = id(session)
+    with account_id_lock:
+        if session_key not in account_ids:
+            try:
+                sts_client = get_client(session, 'sts', None)
+                identity = sts_client.get_caller_identity()
+                account_ids[session_key] = identity['Account']
+            except Exception:
+                account_ids[session_key] = "AccountIdNotFound"
+        return account_ids[session_key]
 
 
-def log_enumeration_failure(service: str, session: CoveSession, error) -> None:
+# clients are thread safe once created, but Session.client() isn't, so they are only created under client_lock
+@functools.lru_cache(maxsize=None)
+def _get_client(session_key: int, service: str, region_name: Optional[str]) -> Any:
+    with client_lock:
+        return create_client(sessions[session_key], service, region_name)
+
+
+def get_client(session: CoveSession, service: str, region_name: Optional[str]) -> Any:
     if hasattr(session, "session_information"):
-        account_id = session.session_information['Id']
-    else:
-        account_id = get_aws_account_id(session)
-    logger.error(f"Failed to count {service} for account: {account_id}, error: {error}")
+        # cove clients only live for one get_cove_region_resources call, see close_cove_clients
+        with client_lock:
+            clients = cove_clients.setdefault(id(session), {})
+            if (service, region_name) not in clients:
+                clients[(service, region_name)] = create_client(session, service, region_name)
+            return clients[(service, region_name)]
+    # the host session lives for the whole run, it is kept in sessions so its id() is never reused
+    sessions.setdefault(id(session), session)
+    return _get_client(id(session), service, region_name)
+
+
+def close_cove_clients(session: CoveSession) -> None:
+    with client_lock:
+        clients = cove_clients.pop(id(session), {})
+    for client in clients.values():
+        client.close()
+
+
+def get_session_region(session: CoveSession, region_name: Optional[str]) -> Optional[str]:
+    # a cove session is bound to a single region, other sessions get the region from the caller
+    if hasattr(session, "session_information"):
+        return session.session_information['Region']
+    return region_name
+
+
+def get_session_account_id(session: CoveSession) -> str:
+    if hasattr(session, "session_information"):
+        return session.session_information['Id']
+    return get_aws_account_id(session)
+
+
+def log_enumeration_failure(service: str, session: CoveSession, error) -> None:
+    account_id = get_session_account_id(session)
+    logger.error("Failed to count %s for account: %s, error: %s", service, account_id, error)
     global has_enumeration_errors
     has_enumeration_errors = True
 
 
-def retry(func):
-    def wrapper(*args, **kwargs):
-        session = args[0]
-        service_name = args[1]
-        display_name = SERVICES_CONF[service_name]["display_name"]
-        error = ""
-        retries = 3
-        for retry in range(retries):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                error = str(e)
-                logger.warning(f"Failed to count {display_name} (attempt {retry + 1} of {retries})")
-        log_enumeration_failure(display_name, session, error)
-        return 0
+def get_results_cache_file(account_id: str, region_name: Optional[str], service_name: str) -> str:
+    return os.path.join(CACHE_DIR, account_id, str(region_name), f"{service_name}.json")
+
+
+def cache_get(account_id: str, region_name: Optional[str], service_name: str) -> Optional[int]:
+    cache_file = get_results_cache_file(account_id, region_name, service_name)
+    try:
+        if time.time() - os.path.getmtime(cache_file) < results_cache_ttl:
+            with open(cache_file) as f:
+                count = json.load(f)
+            # anything but a plain count (a bool is an int too) is treated as a miss and recounted
+            if isinstance(count, int) and not isinstance(count, bool):
+                return count
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def cache_put(account_id: str, region_name: Optional[str], service_name: str, count: int) -> None:
+    cache_file = get_results_cache_file(account_id, region_name, service_name)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(count, f)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning("Failed to cache %s count of %s/%s: %s", service_name, account_id, region_name, e)
+
+
+def cache_result(func):
+    # failures raise before cache_put, so only successful counts are cached
+    def wrapper(session: CoveSession, service_name: str, region_name: Optional[str]) -> int:
+        if results_cache_ttl is None:
+            return func(session, service_name, region_name)
+        account_id = get_session_account_id(session)
+        if account_id == "AccountIdNotFound":
+            return func(session, service_name, region_name)
+        count = cache_get(account_id, region_name, service_name)
+        if count is None:
+            count = func(session, service_name, region_name)
+            cache_put(account_id, region_name, service_name, count)
+        else:
+            global has_cached_results
+            has_cached_results = True
+        return count
 
     return wrapper
 
 
-@retry
+def log_failures(func):
+    # transient and throttling errors are already retried with backoff by the clients (see BOTO_CONFIG)
+    def wrapper(session: CoveSession, service_name: str, region_name: Optional[str] = None) -> int:
+        region_name = get_session_region(session, region_name)
+        breaker_key = get_breaker_key(session)
+        try:
+            if region_breaker.is_open(breaker_key, region_name):
+                raise RegionSkippedError(f"region {region_name} is skipped after repeated connection failures")
+            return func(session, service_name, region_name)
+        except RegionSkippedError:
+            if region_breaker.report_skip(breaker_key, region_name):
+                logger.error("Skipping the remaining services of region %s for account: %s, "
+                             "%d services failed to connect",
+                             region_name, get_session_account_id(session), region_breaker.threshold)
+            global has_enumeration_errors
+            has_enumeration_errors = True
+            return 0
+        except Exception as e:
+            log_enumeration_failure(SERVICES_CONF[service_name]["display_name"], session, str(e))
+            return 0
+
+    return wrapper
+
+
+def count_cluster_fargate_tasks(cluster: str, task_paginator: Any) -> int:
+    task_pages = task_paginator.paginate(cluster=cluster, desiredStatus='RUNNING',
+                                         launchType='FARGATE', PaginationConfig={'PageSize': 100})
+    return sum(1 for _ in task_pages.search("taskArns[]"))
+
+
+@log_failures
+@cache_result
 def get_region_serverless_containers(session: CoveSession, service_name: str, region_name: Optional[str] = None) -> int:
-    if hasattr(session, "session_information"):
-        region_name = session.session_information['Region']
-    client = session.client("ecs", region_name=region_name)
+    client = get_client(session, "ecs", region_name)
     cluster_paginator = client.get_paginator('list_clusters')
-    count = 0
-    for cluster_page in cluster_paginator.paginate():
-        for cluster in cluster_page['clusterArns']:
-            task_paginator = client.get_paginator('list_tasks')
-            for task_page in task_paginator.paginate(cluster=cluster, desiredStatus='RUNNING',
-                                                     launchType='FARGATE'):
-                task_count = len(task_page['taskArns'])
-                count += task_count
-    return count
-
-
-@retry
-def get_region_instances(session: CoveSession, service_name: str, region_name: Optional[str] = None) -> int:
-    if hasattr(session, "session_information"):
-        region_name = session.session_information['Region']
-    client = session.client("ec2", region_name=region_name)
-    paginator = client.get_paginator("describe_instances")
-    count = 0
-    for page in paginator.paginate():
-        for sub_list in page["Reservations"]:
-            count += len(sub_list.get("Instances", []))
-    return count
-
-
-@retry
-def get_region_functions(session: CoveSession, service_name: str, region_name: Optional[str] = None) -> int:
-    if hasattr(session, "session_information"):
-        region_name = session.session_information['Region']
-    client = session.client("lambda", region_name=region_name)
-    paginator = client.get_paginator("list_functions")
-    count = 0
-    for page in paginator.paginate():
-        count += len(page["Functions"])
-    return count
+    task_paginator = client.get_paginator('list_tasks')
+    clusters = list(cluster_paginator.paginate(PaginationConfig={'PageSize': 100}).search("clusterArns[]"))
+    if not clusters:
+        return 0
+    with ThreadPoolExecutor(max_workers=ECS_CLUSTER_WORKERS) as executor:
+        return sum(executor.map(functools.partial(count_cluster_fargate_tasks, task_paginator=task_paginator),
+                                clusters))
 
 
-@retry
-def get_region_ecr_repos(session: CoveSession, service_name: str, region_name: Optional[str] = None) -> int:
-    if hasattr(session, "session_information"):
-        region_name = session.session_information['Region']
-    client = session.client("ecr", region_name=region_name)
-    paginator = client.get_paginator("describe_repositories")
-    count = 0
-    for page in paginator.paginate():
-        count += len(page["repositories"])
-    return count
+@log_failures
+@cache_result
+def count_region_resources(session: CoveSession, service_name: str, region_name: Optional[str] = None) -> int:
+    conf = SERVICES_CONF[service_name]
+    client = get_client(session, conf["client"], region_name)
+    pages = client.get_paginator(conf["operation"]).paginate(**conf["kwargs"])
+    return sum(1 for _ in pages.search(conf["result_path"]))
 
 
-def is_image_used(vm_image: VmImage, client: boto3.client) -> bool:
+def is_image_used(vm_image: VmImage, client: boto3.client, last_valid_use_date: datetime.datetime) -> bool:
     def get_image_last_used_time(vm_image: VmImage) -> Optional[datetime.datetime]:
         params = {
             "ImageId": vm_image.id,
@@ -132,10 +301,9 @@ def is_image_used(vm_image: VmImage, client: boto3.client) -> bool:
         response = client.describe_image_attribute(**params)
 
         if last_launched_time := response.get("LastLaunchedTime", {}).get("Value"):
-            return dateutil.parser.parse(last_launched_time)
+            return datetime.datetime.fromisoformat(last_launched_time.replace("Z", "+00:00"))
         return None
 
-    last_valid_use_date = datetime.datetime.now(dateutil.tz.tzlocal()) - datetime.timedelta(days=30)
     if vm_image.create_time > last_valid_use_date:
         return True
 
@@ -146,92 +314,211 @@ def is_image_used(vm_image: VmImage, client: boto3.client) -> bool:
         return False
 
 
-@retry
+@log_failures
+@cache_result
 def get_region_vm_images(session: CoveSession, service_name: str, region_name: Optional[str] = None) -> int:
-    if hasattr(session, "session_information"):
-        region_name = session.session_information['Region']
-    client = session.client("ec2", region_name=region_name)
+    client = get_client(session, "ec2", region_name)
     paginator = client.get_paginator("describe_images")
-    vm_images: List[VmImage] = []
-    for page in paginator.paginate(Owners=['self']):
-        vm_images.extend([VmImage(id=image["ImageId"], create_time=datetime.datetime.fromisoformat(
-            image["CreationDate"].replace("Z", "+00:00"))) for image in page["Images"]])
-    used_vm_images_count = len([vm_image.id for vm_image in vm_images if is_image_used(vm_image, client)])
+    pages = paginator.paginate(Owners=['self'], PaginationConfig={'PageSize': 1000})
+    images: List[List[str]] = list(pages.search("Images[].[ImageId, CreationDate]"))
+    last_valid_use_date = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=30)
+    # CreationDate is UTC ISO-8601 (2024-01-15T10:30:00.000Z), so its seconds prefix sorts in time order
+    # and only old images need to be parsed
+    cutoff = last_valid_use_date.strftime("%Y-%m-%dT%H:%M:%S")
+    old_vm_images: List[VmImage] = [
+        VmImage(id=image_id, create_time=datetime.datetime.fromisoformat(creation_date.replace("Z", "+00:00")))
+        for image_id, creation_date in images if creation_date[:len(cutoff)] <= cutoff]
+    used_vm_images_count = len(images) - len(old_vm_images)
+    if not old_vm_images:
+        return used_vm_images_count
+    # every old image costs a describe_image_attribute round trip, check them concurrently
+    with ThreadPoolExecutor(max_workers=IMAGE_ATTRIBUTE_WORKERS) as executor:
+        used_images = executor.map(functools.partial(is_image_used, client=client,
+                                                     last_valid_use_date=last_valid_use_date), old_vm_images)
+        used_vm_images_count += sum(1 for used in used_images if used)
     return used_vm_images_count
 
 
-@retry
-def get_region_cluster_nodes(session: CoveSession, service_name: str, region_name: Optional[str] = None) -> int:
-    if hasattr(session, "session_information"):
-        region_name = session.session_information['Region']
-    eks_client = session.client("eks", region_name=region_name)
-    cluster_paginator = eks_client.get_paginator('list_clusters')
-    ec2_client = session.client("ec2", region_name=region_name)
-    instance_paginator = ec2_client.get_paginator('describe_instances')
-    count = 0
-    for clusters in cluster_paginator.paginate():
-        for cluster in clusters['clusters']:
-            _filter = [{
-                'Name': 'tag:aws:eks:cluster-name',
-                'Values': [cluster]
-            }]
-            for page in instance_paginator.paginate(Filters=_filter):
-                for sub_list in page["Reservations"]:
-                    count += len(sub_list.get("Instances", []))
-    return count
-
-
 SERVICES_CONF: Dict[str, Any] = {
     "ec2": {
-        "function": get_region_instances,
+        "function": count_region_resources,
+        "client": "ec2",
+        "operation": "describe_instances",
+        "result_path": "Reservations[].Instances[].InstanceId",
+        "kwargs": {"Filters": [ACTIVE_INSTANCE_FILTER], "PaginationConfig": {"PageSize": 1000}},
         "display_name": "Virtual Machines",
         "workload_units": 1
     },
     "lambda": {
-        "function": get_region_functions,
+        "function": count_region_resources,
+        "client": "lambda",
+        "operation": "list_functions",
+        "result_path": "Functions[].FunctionName",
+        "kwargs": {"PaginationConfig": {"PageSize": 50}},
         "display_name": "Serverless Functions",
         "workload_units": 50
     },
     "ecr": {
-        "function": get_region_ecr_repos,
+        "function": count_region_resources,
+        "client": "ecr",
+        "operation": "describe_repositories",
+        "result_path": "repositories[].repositoryName",
+        "kwargs": {"PaginationConfig": {"PageSize": 1000}},
         "display_name": "Container Images",
         "workload_units": 10
     },
     "ami": {
         "function": get_region_vm_images,
+        "client": "ec2",
         "display_name": "VM Images",
         "workload_units": 1
     },
     "ecs": {
         "function": get_region_serverless_containers,
+        "client": "ecs",
         "display_name": "Serverless Containers",
         "workload_units": 10
     },
     "eks": {
-        "function": get_region_cluster_nodes,
+        "function": count_region_resources,
+        "client": "ec2",
+        "operation": "describe_instances",
+        "result_path": "Reservations[].Instances[].InstanceId",
+        "kwargs": {"Filters": [ACTIVE_INSTANCE_FILTER, EKS_NODE_FILTER], "PaginationConfig": {"PageSize": 1000}},
         "display_name": "Container Hosts",
         "workload_units": 1
     }
 }
 
-ALL_REGIONS = [r["RegionName"] for r in boto3.client("ec2").describe_regions()["Regions"]]
+
+def get_regions_cache_file(session: boto3.Session) -> Optional[str]:
+    # opted-in regions differ between accounts, so the cache file is bound to the account rather than to
+    # the (possibly short-lived) credentials in use
+    account_id = get_aws_account_id(session)
+    if account_id == "AccountIdNotFound":
+        return None
+    return os.path.join(CACHE_DIR, f"regions-{account_id}.json")
+
+
+def load_regions(session: boto3.Session) -> List[str]:
+    cache_file = get_regions_cache_file(session)
+    if cache_file:
+        try:
+            if time.time() - os.path.getmtime(cache_file) < REGIONS_CACHE_TTL:
+                with open(cache_file) as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    client = get_client(session, "ec2", None)
+    regions = [r["RegionName"] for r in client.describe_regions(AllRegions=False,
+                                                                Filters=[ENABLED_REGIONS_FILTER])["Regions"]]
+    if cache_file:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_file, "w") as f:
+                json.dump(regions, f)
+        except OSError as e:
+            logger.warning("Failed to cache the regions list: %s", e)
+    return regions
+
+
+@functools.lru_cache(maxsize=None)
+def get_service_regions(client_name: str) -> FrozenSet[str]:
+    return frozenset(boto3.Session().get_available_regions(client_name))
+
+
+def is_service_available(service_name: str, region: str) -> bool:
+    # regions newer than botocore's bundled endpoints data are unknown to every service, count them anyway
+    if region not in get_service_regions("ec2"):
+        return True
+    return region in get_service_regions(SERVICES_CONF[service_name]["client"])
+
+
+def get_config_recorded_types(client: Any) -> FrozenSet[str]:
+    statuses = client.describe_configuration_recorder_status()["ConfigurationRecordersStatus"]
+    if not any(status.get("recording") for status in statuses):
+        return frozenset()
+    recorded_types = set()
+    for recorder in client.describe_configuration_recorders()["ConfigurationRecorders"]:
+        group = recorder.get("recordingGroup", {})
+        strategy = group.get("recordingStrategy", {}).get("useOnly")
+        if group.get("allSupported") or strategy == "ALL_SUPPORTED_RESOURCE_TYPES":
+            recorded_types.update(CONFIG_RESOURCE_TYPES.values())
+        elif strategy == "EXCLUSION_BY_RESOURCE_TYPES":
+            excluded = group.get("exclusionByResourceTypes", {}).get("resourceTypes", [])
+            recorded_types.update(set(CONFIG_RESOURCE_TYPES.values()) - set(excluded))
+        else:
+            recorded_types.update(group.get("resourceTypes", []))
+    return frozenset(recorded_types)
+
+
+def get_region_config_counts(session: CoveSession, region_name: str) -> Dict[str, int]:
+    # an empty result means the services have to be enumerated, e.g. when Config isn't recording in the region
+    try:
+        client = get_client(session, "config", region_name)
+        recorded_types = get_config_recorded_types(client)
+        resource_types = {resource_type: service_name for service_name, resource_type in CONFIG_RESOURCE_TYPES.items()
+                          if service_name in SERVICES_CONF and resource_type in recorded_types}
+        if not resource_types:
+            return {}
+        response = client.get_discovered_resource_counts(resourceTypes=list(resource_types))
+    except Exception as e:
+        logger.warning("Failed to read AWS Config resource counts of region %s for account: %s, "
+                       "enumerating instead, error: %s", region_name, get_session_account_id(session), e)
+        return {}
+    counts = dict.fromkeys(resource_types.values(), 0)
+    for resource_count in response["resourceCounts"]:
+        counts[resource_types[resource_count["resourceType"]]] = resource_count["count"]
+    return counts
 
 
-@cove(regions=ALL_REGIONS)
 def get_cove_region_resources(session: CoveSession) -> Dict[str, int]:
-    results: Dict[str, int] = defaultdict(int)
-    for service_name, conf in SERVICES_CONF.items():
-        results[service_name] += conf["function"](session, service_name)
+    results: Dict[str, int] = Counter(dict.fromkeys(SERVICES_CONF, 0))
+    region = session.session_information['Region']
+    try:
+        config_counts = get_region_config_counts(session, region) if use_config_counts else {}
+        results.update(config_counts)
+        # clients are created under client_lock, so the cove session can be shared by the service threads
+        with ThreadPoolExecutor(max_workers=len(SERVICES_CONF)) as executor:
+            futures = {executor.submit(conf["function"], session, service_name): service_name
+                       for service_name, conf in SERVICES_CONF.items()
+                       if is_service_available(service_name, region) and service_name not in config_counts}
+            for future in as_completed(futures):
+                results[futures[future]] += future.result()
+    finally:
+        # release this account/region's connections instead of keeping them open for the rest of the sweep
+        close_cove_clients(session)
     return results
 
 
-def current_account_resources_count(session: boto3.Session) -> Dict[str, int]:
-    logger.info(f"Counting resources for the current account...")
-    total_results: Dict[str, int] = defaultdict(int)
-    for i, region in enumerate(ALL_REGIONS):
-        logger.info(f"Region: {region} ({i + 1}/{len(ALL_REGIONS)})")
-        for service_name, conf in SERVICES_CONF.items():
-            total_results[service_name] += conf["function"](session, service_name, region)
+def current_account_resources_count(session: boto3.Session, regions: List[str]) -> Counter:
+    logger.info("Counting resources for the current account...")
+    total_results: Counter = Counter(dict.fromkeys(SERVICES_CONF, 0))
+    config_counts: Dict[str, Dict[str, int]] = {}
+    if use_config_counts:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            region_counts = executor.map(functools.partial(get_region_config_counts, session), regions)
+            config_counts = dict(zip(regions, region_counts))
+        for counts in config_counts.values():
+            total_results.update(counts)
+    region_services = [(service_name, conf["function"], region)
+                       for region in regions for service_name, conf in SERVICES_CONF.items()
+                       if is_service_available(service_name, region)
+                       and service_name not in config_counts.get(region, {})]
+    pending_services: Dict[str, int] = defaultdict(int)
+    for _, _, region in region_services:
+        pending_services[region] += 1
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(function, session, service_name, region): (service_name, region)
+                   for service_name, function, region in region_services}
+        for future in as_completed(futures):
+            service_name, region = futures[future]
+            total_results[service_name] += future.result()
+            pending_services[region] -= 1
+            if not pending_services[region]:
+                done_regions = len(pending_services) - sum(1 for pending in pending_services.values() if pending)
+                logger.info("Region: %s (%d/%d)", region, done_regions, len(pending_services))
     return total_results
 
 
@@ -242,10 +529,11 @@ def print_results(results: Dict[str, int], account_id: Optional[str]=None) -> No
     for service, count in results.items():
         if service == "ecr":
             count = count * 1.1  # we scan 2 images per one repository and we decided to multiply the count by 1.1 based on production statistics
-        workloads = round(count / SERVICES_CONF[service]['workload_units'])
+        conf = SERVICES_CONF[service]
+        workloads = round(count / conf['workload_units'])
         if workloads == 0 and count > 0:
             workloads = 1
-        result_str += f"{SERVICES_CONF[service]['display_name']} Count: {round(count)}{f' (Workload Units: {workloads})' if log_total_results else ''}\n"
+        result_str += f"{conf['display_name']} Count: {round(count)}{f' (Workload Units: {workloads})' if log_total_results else ''}\n"
         total_workloads += workloads
     if log_total_results:
         result_str += f"-----------------------------------------\nTOTAL estimated workload units: {total_workloads}\n"
@@ -253,11 +541,9 @@ def print_results(results: Dict[str, int], account_id: Optional[str]=None) -> No
 
 
 def log_results_per_account(total_results: Dict[str, Any]) -> None:
-    results_per_account: Dict[str, Dict[str, int]] = {result["Id"]: defaultdict(int) for result in total_results["Results"]}
+    results_per_account: Dict[str, Counter] = {}
     for result in total_results["Results"]:
-        account_id = result["Id"]
-        for service, count in result["Result"].items():
-            results_per_account[account_id][service] += count
+        results_per_account.setdefault(result["Id"], Counter()).update(result["Result"])
     for account_id, results in results_per_account.items():
         print_results(results, account_id)
 
@@ -283,7 +569,21 @@ def set_skip_resources(args: argparse.Namespace) -> None:
         skipped_resources.append(SERVICES_CONF["eks"]['display_name'])
         SERVICES_CONF.pop("eks")
     if skipped_resources:
-        logger.info(f"Skip counting the following resources: {', '.join(skipped_resources)}.")
+        logger.info("Skip counting the following resources: %s.", ", ".join(skipped_resources))
+
+
+def non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative, got {value}")
+    return number
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive number, got {value}")
+    return number
 
 
 def main():
@@ -291,6 +591,9 @@ def main():
     _parser.add_argument("--only-current-account", action="store_true",
                          help="Count resources only for the current account")
 
+    _parser.add_argument("--regions", nargs="+", metavar="REGION",
+                         help="Count resources only in these regions (default: all enabled regions)")
+
     _parser.add_argument("--skip-vms", action="store_true",
                          help=f"Skip counting {SERVICES_CONF['ec2']['display_name']}")
 
@@ -312,14 +615,33 @@ def main():
     _parser.add_argument("--show-logs-per-account", action="store_true",
                          help=f"Log resource count per AWS account")
 
+    _parser.add_argument("--account-workers", type=positive_int, default=DEFAULT_ACCOUNT_WORKERS,
+                         help=f"Number of Organization account/region pairs counted in parallel "
+                              f"(default: {DEFAULT_ACCOUNT_WORKERS})")
+
+    _parser.add_argument("--use-aws-config", action="store_true",
+                         help="Take Virtual Machines, Serverless Functions and Container Images counts "
+                              "from AWS Config in regions where it records them")
+
+    _parser.add_argument("--cache-ttl", type=non_negative_int, default=DEFAULT_RESULTS_CACHE_TTL,
+                         help=f"Seconds to reuse cached per account/region counts from {CACHE_DIR}, "
+                              f"0 disables the cache (default: {DEFAULT_RESULTS_CACHE_TTL})")
+
+    _parser.add_argument("--no-cache", action="store_true",
+                         help="Count all resources again, ignoring cached results")
+
     args = _parser.parse_args()
     set_skip_resources(args)
     if not SERVICES_CONF:
         logger.info("All AWS services requested to be skipped, please choose at least one service to count.")
         return
     show_logs_per_account: bool = args.show_logs_per_account
+    global results_cache_ttl, use_config_counts
+    results_cache_ttl = None if args.no_cache or not args.cache_ttl else args.cache_ttl
+    use_config_counts = args.use_aws_config
     session = boto3.Session()
-    total_results: Dict[str, int] = current_account_resources_count(session)
+    regions = args.regions or load_regions(session)
+    total_results: Counter = current_account_resources_count(session, regions)
     if args.only_current_account:
         if show_logs_per_account:
             print_results(total_results, account_id=get_aws_account_id(session=session))
@@ -327,21 +649,21 @@ def main():
     else:
         try:
             logger.info("Start Counting resources for all the Organization's accounts...")
-            results_of_all_regions = get_cove_region_resources()
+            results_of_all_regions = cove(get_cove_region_resources, regions=regions,
+                                          thread_workers=args.account_workers)()
             if show_logs_per_account:  # log current account results
                 print_results(total_results, account_id=get_aws_account_id(session=session))
             for result in results_of_all_regions["Results"]:
-                for service, count in result["Result"].items():
-                    total_results[service] += count
+                total_results.update(result["Result"])
             if show_logs_per_account:
                 log_results_per_account(results_of_all_regions)
             print_results(total_results)
 
             errors = len(results_of_all_regions["Exceptions"] + results_of_all_regions["FailedAssumeRole"])
             if errors:
-                logger.warning(f"Encountered {errors} errors")
-                logger.warning(f"Exceptions: {results_of_all_regions['Exceptions']}")
-                logger.warning(f"FailedAssumeRole: {results_of_all_regions['FailedAssumeRole']}")
+                logger.warning("Encountered %d errors", errors)
+                logger.warning("Exceptions: %s", results_of_all_regions['Exceptions'])
+                logger.warning("FailedAssumeRole: %s", results_of_all_regions['FailedAssumeRole'])
         except AttributeError as e:
             if "'CoveHostAccount' object has no attribute 'organization_account_ids'" in str(e):
                 logger.warning(
@@ -349,8 +671,12 @@ def main():
                     "Couldn't count resources for the nested accounts, this account is not an Organization account.\n"
                     "-------------------------------------------------------------------------------------------")
 
+    if has_cached_results:
+        logger.info("Some counts were read from cached results in %s, use --no-cache to force a full recount",
+                    CACHE_DIR)
+
     if has_enumeration_errors:
-        logger.warning(f"Errors encounters during resource enumeration, please look for errors in log file: {LOG_FILE}")
+        logger.warning("Errors encounters during resource enumeration, please look for errors in log file: %s", LOG_FILE)
 
 
 if __name__ == "__main__":